@@ -8,143 +8,305 @@ calendar.py — Economic Calendar Parser
 """
 
 import argparse
+import collections
 import csv
+import functools
+import gzip
 import hashlib
 import json
 import logging
 import os
+import re
 import sqlite3
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Optional
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 from dateutil import parser as dateparser, tz
 
+try:
+    import orjson  # опционально: быстрая сериализация JSON
+except ImportError:
+    orjson = None
+
 # -------------------------------
 # Константы
 # -------------------------------
 USER_AGENT = "calendar.py (educational; contact: you@example.com)"
-IMPORTANCE_MAP = {
-    "low": "low",
-    "medium": "medium",
-    "high": "high"
-}
+IMPORTANCE_LEVELS = frozenset(("low", "medium", "high"))
+
+# Нормализованное событие; порядок полей = порядок колонок CSV
+Event = collections.namedtuple(
+    "Event",
+    "provider title country importance time_utc time_local timezone "
+    "actual_value forecast_value previous_value id",
+)
+
+# Общая HTTP-сессия: keep-alive и пул соединений на все провайдеры
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+HTTP_TIMEOUT = (5, 20)  # (connect, read)
+IO_BUFFER_SIZE = 64 * 1024  # буфер записи CSV/JSON
+HTTP_CACHE_FILE = ".http_cache.json"  # кэш условных GET внутри --out-dir
 
 # -------------------------------
 # Утилиты
 # -------------------------------
 
-def sha1_id(*args) -> str:
-    """Генерация ID события на основе строки"""
-    text = "|".join([str(a) for a in args if a])
-    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+def event_id(*args) -> str:
+    """Генерация ID события на основе строки (BLAKE2b, 80 бит — ключ дедупликации, не криптография)"""
+    text = "|".join(str(a) for a in args if a)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=10).hexdigest()
+
+_NUM_STRIP = str.maketrans("", "", ",")
+_NUM_RE = re.compile(r"([-+]?(?:\d+(?:\.\d*)?|\.\d+))([KMB%]?)", re.ASCII)
+_NUM_MULT = {"": 1.0, "%": 1.0, "K": 1e3, "M": 1e6, "B": 1e9}
 
 def parse_number(s: Optional[str]) -> Optional[float]:
     """Парсинг числовых значений: '236K' -> 236000.0, '3.1%' -> 3.1"""
     if not s:
         return None
-    s = s.strip().replace(",", "")
-    mult = 1
-    if s.endswith("%"):
-        s = s.replace("%", "")
-    if s.endswith("K"):
-        mult = 1e3
-        s = s.replace("K", "")
-    elif s.endswith("M"):
-        mult = 1e6
-        s = s.replace("M", "")
+    m = _NUM_RE.fullmatch(s.strip().translate(_NUM_STRIP))
+    if not m:
+        return None
+    return float(m.group(1)) * _NUM_MULT[m.group(2)]
+
+# Время ForexFactory: '8:30am', '12:05pm'
+_FF_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})(am|pm)", re.ASCII | re.IGNORECASE)
+
+@functools.lru_cache(maxsize=32)
+def _zone(name: str):
+    """Кэшированный поиск часового пояса по имени"""
+    return tz.gettz(name)
+
+def _parse_dt(dt_str: str, base_date: Optional[datetime] = None) -> datetime:
+    """Быстрый разбор известных форматов, dateutil — только как запасной вариант.
+
+    С base_date ожидается время ForexFactory ('8:30am'), иначе — ISO (Investing).
+    """
     try:
-        return float(s) * mult
+        if base_date is not None:
+            m = _FF_TIME_RE.fullmatch(dt_str)
+            if m and 1 <= int(m.group(1)) <= 12:
+                hour = int(m.group(1)) % 12 + (12 if m.group(3).lower() == "pm" else 0)
+                return base_date.replace(hour=hour, minute=int(m.group(2)))
+            raise ValueError(dt_str)
+        return datetime.fromisoformat(dt_str)
     except ValueError:
-        return None
+        return dateparser.parse(dt_str, default=base_date)
 
-def convert_time(dt_str: str, tz_from: str, tz_to: str) -> (str, str):
-    """Конвертация времени из одной зоны в UTC и в локальную (--tz)"""
+def convert_time_fast(dt_str: str, from_zone, to_zone, base_date: Optional[datetime] = None) -> (str, str):
+    """Конвертация времени из from_zone в UTC и в to_zone (tzinfo находим заранее, вне цикла по строкам)"""
     try:
-        dt_obj = dateparser.parse(dt_str)
-        if tz_from:
-            from_zone = tz.gettz(tz_from)
-            dt_obj = dt_obj.replace(tzinfo=from_zone)
-        else:
-            dt_obj = dt_obj.replace(tzinfo=tz.UTC)
+        dt_obj = _parse_dt(dt_str, base_date)
+        dt_obj = dt_obj.replace(tzinfo=from_zone)
         utc_time = dt_obj.astimezone(tz.UTC)
-        local_time = dt_obj.astimezone(tz.gettz(tz_to))
+        local_time = dt_obj.astimezone(to_zone)
         return utc_time.isoformat(), local_time.strftime("%Y-%m-%d %H:%M")
     except Exception:
         return None, None
 
+# -------------------------------
+# HTTP-кэш (ETag / Last-Modified)
+# -------------------------------
+
+class HttpCache:
+    """Валидаторы ответа и разобранные события по ключу (URL + фильтры).
+
+    При 304 Not Modified провайдер берёт события отсюда и не парсит страницу.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    @staticmethod
+    def key(url: str, countries: List[str], importance: List[str]) -> str:
+        return "|".join([url, ",".join(sorted(countries or [])), ",".join(sorted(importance or []))])
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        entry = self._entries.get(key)
+        headers = {}
+        # Без пригодных событий 304 нечем обслужить — запрос должен быть безусловным
+        if entry and self.events(key) is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def events(self, key: str) -> Optional[List[Event]]:
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        try:
+            return [Event(**d) for d in entry["events"]]
+        except (KeyError, TypeError):
+            return None  # запись старого формата: условных заголовков не шлём, страница загрузится заново
+
+    def store(self, key: str, validators, events: List[Event]):
+        etag, last_modified = validators
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._entries[key] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "events": [e._asdict() for e in events],
+            }
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as f:
+                json.dump(self._entries, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+
 # -------------------------------
 # Базовый класс провайдера
 # -------------------------------
 
 class ProviderBase:
-    def fetch(self, date_from: str, date_to: str, countries: List[str], importance: List[str]) -> List[Dict[str, Any]]:
+    def __init__(self, cache: Optional[HttpCache] = None):
+        self.cache = cache
+
+    def fetch(self, date_from: str, date_to: str, countries: List[str], importance: List[str]) -> List[Event]:
         raise NotImplementedError
 
+    def _get(self, url: str, cache_key: str):
+        """Условный GET. Возвращает (status_code, тело в байтах, (ETag, Last-Modified))"""
+        headers = self.cache.conditional_headers(cache_key) if self.cache else {}
+        # Парсим байты напрямую: без декодирования всего тела в str
+        with SESSION.get(url, headers=headers, timeout=HTTP_TIMEOUT, stream=True) as resp:
+            if resp.status_code != 200:
+                return resp.status_code, None, None
+            return 200, resp.content, (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+
+    def _cached(self, status: int, cache_key: str) -> Optional[List[Event]]:
+        """События из кэша, если сервер ответил 304"""
+        if status == 304 and self.cache:
+            return self.cache.events(cache_key)
+        return None
+
+    def _remember(self, cache_key: str, validators, events: List[Event]):
+        if self.cache:
+            self.cache.store(cache_key, validators, events)
+
 # -------------------------------
 # Провайдер: ForexFactory
 # -------------------------------
 
 class ForexFactoryProvider(ProviderBase):
     BASE_URL = "https://www.forexfactory.com/calendar"
+    ROW_SELECTOR = "tr.calendar_row"
+    CELL_CLASSES = frozenset((
+        "calendar__time", "calendar__event", "calendar__country", "calendar__impact",
+        "calendar__actual", "calendar__forecast", "calendar__previous",
+    ))
+    # Один селектор на все ячейки: строка обходится и селектор разбирается один раз
+    CELLS_SELECTOR = ", ".join("." + c for c in sorted(CELL_CLASSES))
+
+    @classmethod
+    def _cells(cls, row) -> Dict[str, object]:
+        """Первая ячейка каждого класса из CELL_CLASSES (как css_first) за один запрос"""
+        cells = {}
+        for node in row.css(cls.CELLS_SELECTOR):
+            for name in (node.attributes.get("class") or "").split():
+                if name in cls.CELL_CLASSES and name not in cells:
+                    cells[name] = node
+        return cells
 
     def fetch(self, date_from, date_to, countries, importance):
         logging.info("Загружаем ForexFactory...")
         # ⚠️ Здесь пример. Страницу можно адаптировать по факту.
         url = f"{self.BASE_URL}?week={date_from}"
-        headers = {"User-Agent": USER_AGENT}
-        resp = requests.get(url, headers=headers, timeout=20)
-        if resp.status_code != 200:
+        cache_key = HttpCache.key(url, countries, importance)
+        status, html, validators = self._get(url, cache_key)
+        cached = self._cached(status, cache_key)
+        if cached is not None:
+            logging.info("ForexFactory: страница не изменилась, берём события из кэша")
+            return cached
+        if status != 200:
             logging.warning("ForexFactory: не удалось загрузить")
             return []
-        soup = BeautifulSoup(resp.text, "lxml")
-        events = []
-        rows = soup.select("tr.calendar_row")
+        countries_set = frozenset(countries) if countries else None
+        importance_set = frozenset(importance) if importance else None
+        from_zone, to_zone = _zone("America/New_York"), _zone("UTC")
+        try:
+            base_date = datetime.strptime(date_from, "%Y-%m-%d")
+        except ValueError:
+            base_date = None
+        tree = LexborHTMLParser(html)
+        rows = tree.css(self.ROW_SELECTOR)
+        # Список заранее нужного размера; лишний хвост отрезаем после цикла
+        events = [None] * len(rows)
+        out = 0
         for row in rows:
             try:
-                time_cell = row.select_one(".calendar__time")
-                title_cell = row.select_one(".calendar__event")
-                country_cell = row.select_one(".calendar__country")
-                impact_cell = row.select_one(".calendar__impact")
-                actual_cell = row.select_one(".calendar__actual")
-                forecast_cell = row.select_one(".calendar__forecast")
-                previous_cell = row.select_one(".calendar__previous")
-
+                cells = self._cells(row)
+                title_cell = cells.get("calendar__event")
                 if not title_cell:
                     continue
 
-                title = title_cell.get_text(strip=True)
-                country = country_cell.get_text(strip=True) if country_cell else ""
-                imp = impact_cell.get_text(strip=True).lower() if impact_cell else "medium"
+                country_cell = cells.get("calendar__country")
+                impact_cell = cells.get("calendar__impact")
+                country = country_cell.text(strip=True) if country_cell else ""
+                imp = impact_cell.text(strip=True).lower() if impact_cell else "medium"
 
-                # Фильтрация по стране и важности
-                if countries and country not in countries:
+                # Фильтрация по стране и важности — до разбора времени и чисел
+                if countries_set is not None and country not in countries_set:
                     continue
-                if importance and imp not in importance:
+                if importance_set is not None and imp not in importance_set:
                     continue
 
-                dt_str = time_cell.get_text(strip=True)
-                utc_time, local_time = convert_time(dt_str, "America/New_York", "UTC")
-
-                event = {
-                    "provider": "forex_factory",
-                    "title": title,
-                    "country": country,
-                    "importance": IMPORTANCE_MAP.get(imp, "medium"),
-                    "time_utc": utc_time,
-                    "time_local": local_time,
-                    "timezone": "UTC",
-                    "actual_value": parse_number(actual_cell.get_text(strip=True)) if actual_cell else None,
-                    "forecast_value": parse_number(forecast_cell.get_text(strip=True)) if forecast_cell else None,
-                    "previous_value": parse_number(previous_cell.get_text(strip=True)) if previous_cell else None,
-                }
-                event["id"] = sha1_id(event["provider"], event["title"], event["country"], event["time_utc"])
-                events.append(event)
+                title = title_cell.text(strip=True)
+                time_cell = cells.get("calendar__time")
+                actual_cell = cells.get("calendar__actual")
+                forecast_cell = cells.get("calendar__forecast")
+                previous_cell = cells.get("calendar__previous")
+
+                dt_str = time_cell.text(strip=True)
+                utc_time, local_time = convert_time_fast(dt_str, from_zone, to_zone, base_date)
+
+                event = Event(
+                    provider="forex_factory",
+                    title=title,
+                    country=country,
+                    importance=imp if imp in IMPORTANCE_LEVELS else "medium",
+                    time_utc=utc_time,
+                    time_local=local_time,
+                    timezone="UTC",
+                    actual_value=parse_number(actual_cell.text(strip=True)) if actual_cell else None,
+                    forecast_value=parse_number(forecast_cell.text(strip=True)) if forecast_cell else None,
+                    previous_value=parse_number(previous_cell.text(strip=True)) if previous_cell else None,
+                    id=event_id("forex_factory", title, country, utc_time),
+                )
+                events[out] = event
+                out += 1
             except Exception as e:
                 logging.debug(f"Ошибка парсинга строки: {e}")
+        del events[out:]
+        self._remember(cache_key, validators, events)
         return events
 
 # -------------------------------
@@ -153,68 +315,98 @@ class ForexFactoryProvider(ProviderBase):
 
 class InvestingProvider(ProviderBase):
     BASE_URL = "https://www.investing.com/economic-calendar/"
+    ROW_SELECTOR = "tr.js-event-item"
 
     def fetch(self, date_from, date_to, countries, importance):
         logging.info("Загружаем Investing.com...")
-        headers = {"User-Agent": USER_AGENT}
-        resp = requests.get(self.BASE_URL, headers=headers, timeout=20)
-        if resp.status_code != 200:
+        cache_key = HttpCache.key(self.BASE_URL, countries, importance)
+        status, html, validators = self._get(self.BASE_URL, cache_key)
+        cached = self._cached(status, cache_key)
+        if cached is not None:
+            logging.info("Investing.com: страница не изменилась, берём события из кэша")
+            return cached
+        if status != 200:
             logging.warning("Investing.com: не удалось загрузить")
             return []
-        soup = BeautifulSoup(resp.text, "lxml")
-        events = []
+        countries_set = frozenset(countries) if countries else None
+        importance_set = frozenset(importance) if importance else None
+        utc_zone = _zone("UTC")
+        tree = LexborHTMLParser(html)
         # ⚠️ Аналогично — структура упрощена
-        rows = soup.select("tr.js-event-item")
+        rows = tree.css(self.ROW_SELECTOR)
+        events = [None] * len(rows)
+        out = 0
         for row in rows:
             try:
-                title = row.get("data-event-title", "")
-                country = row.get("data-country", "")
-                imp = row.get("data-event-importance", "medium").lower()
-                dt_str = row.get("data-event-datetime", "")
-                utc_time, local_time = convert_time(dt_str, "UTC", "UTC")
+                attrs = row.attributes
+                country = attrs.get("data-country") or ""
+                imp = (attrs.get("data-event-importance") or "medium").lower()
 
-                if countries and country not in countries:
+                if countries_set is not None and country not in countries_set:
                     continue
-                if importance and imp not in importance:
+                if importance_set is not None and imp not in importance_set:
                     continue
 
-                event = {
-                    "provider": "investing_com",
-                    "title": title,
-                    "country": country,
-                    "importance": IMPORTANCE_MAP.get(imp, "medium"),
-                    "time_utc": utc_time,
-                    "time_local": local_time,
-                    "timezone": "UTC",
-                    "actual_value": None,
-                    "forecast_value": None,
-                    "previous_value": None,
-                }
-                event["id"] = sha1_id(event["provider"], event["title"], event["country"], event["time_utc"])
-                events.append(event)
+                title = attrs.get("data-event-title") or ""
+                dt_str = attrs.get("data-event-datetime") or ""
+                utc_time, local_time = convert_time_fast(dt_str, utc_zone, utc_zone)
+
+                event = Event(
+                    provider="investing_com",
+                    title=title,
+                    country=country,
+                    importance=imp if imp in IMPORTANCE_LEVELS else "medium",
+                    time_utc=utc_time,
+                    time_local=local_time,
+                    timezone="UTC",
+                    actual_value=None,
+                    forecast_value=None,
+                    previous_value=None,
+                    id=event_id("investing_com", title, country, utc_time),
+                )
+                events[out] = event
+                out += 1
             except Exception as e:
                 logging.debug(f"Ошибка парсинга строки Investing: {e}")
+        del events[out:]
+        self._remember(cache_key, validators, events)
         return events
 
 # -------------------------------
 # Сохранение
 # -------------------------------
 
-def save_csv(events: List[Dict[str, Any]], path: str):
-    keys = list(events[0].keys())
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
+def save_csv(events: List[Event], path: str):
+    if path.endswith(".gz"):
+        # Уровень 1: в разы быстрее уровня 9 при близкой степени сжатия
+        f = gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=1)
+    else:
+        f = open(path, "w", newline="", encoding="utf-8", buffering=IO_BUFFER_SIZE)
+    with f:
+        writer = csv.writer(f)
+        writer.writerow(Event._fields)
         writer.writerows(events)
     logging.info(f"Сохранено CSV: {path}")
 
-def save_json(events: List[Dict[str, Any]], path: str):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(events, f, ensure_ascii=False, indent=2)
+def save_json(events: List[Event], path: str):
+    records = [e._asdict() for e in events]
+    if orjson is not None:
+        # orjson сразу отдаёт UTF-8 байты
+        with open(path, "wb", buffering=IO_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(records))
+    else:
+        with open(path, "w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as f:
+            json.dump(records, f, ensure_ascii=False, separators=(",", ":"))
     logging.info(f"Сохранено JSON: {path}")
 
-def save_sqlite(events: List[Dict[str, Any]], path: str):
+SQLITE_INSERT = "INSERT OR IGNORE INTO events ({}) VALUES ({})".format(
+    ", ".join(Event._fields), ",".join("?" * len(Event._fields))
+)
+
+def save_sqlite(events: List[Event], path: str):
     conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     cur = conn.cursor()
     cur.execute("""
     CREATE TABLE IF NOT EXISTS events (
@@ -230,14 +422,10 @@ def save_sqlite(events: List[Dict[str, Any]], path: str):
       forecast_value REAL,
       previous_value REAL
     )""")
-    for e in events:
-        cur.execute("""INSERT OR IGNORE INTO events
-          (id, provider, title, country, importance, time_utc, time_local, timezone,
-          actual_value, forecast_value, previous_value)
-          VALUES (?,?,?,?,?,?,?,?,?,?,?)""",
-          (e["id"], e["provider"], e["title"], e["country"], e["importance"], e["time_utc"], e["time_local"],
-           e["timezone"], e["actual_value"], e["forecast_value"], e["previous_value"]))
-    conn.commit()
+    # Колонки в порядке полей Event — кортежи событий идут в executemany как есть.
+    # Одна транзакция на всю пачку вместо построчных INSERT
+    with conn:
+        cur.executemany(SQLITE_INSERT, events)
     conn.close()
     logging.info(f"Сохранено в SQLite: {path}")
 
@@ -245,9 +433,9 @@ def save_sqlite(events: List[Dict[str, Any]], path: str):
 # Уведомления
 # -------------------------------
 
-def notify_upcoming(events: List[Dict[str, Any]], window: str, tz_name: str):
+def notify_upcoming(events: List[Event], window: str, tz_name: str):
     """Показать события в ближайшее время"""
-    now = datetime.now(tz=tz.gettz(tz_name))
+    now = datetime.now(tz=_zone(tz_name))
     # интерпретация окна (например "24h")
     num, unit = int(window[:-1]), window[-1]
     if unit == "h":
@@ -256,13 +444,15 @@ def notify_upcoming(events: List[Dict[str, Any]], window: str, tz_name: str):
         delta = timedelta(minutes=num)
     else:
         delta = timedelta(hours=24)
-    until = now + delta
-    for e in events:
-        if not e["time_utc"]:
-            continue
-        ev_time = dateparser.parse(e["time_utc"])
-        if now.astimezone(tz.UTC) <= ev_time <= until.astimezone(tz.UTC):
-            print(f"[{e['time_local']}] {e['country']} • {e['title']} • {e['importance'].upper()}")
+    now_utc = now.astimezone(tz.UTC)
+    until_utc = (now + delta).astimezone(tz.UTC)
+    # time_utc всегда в ISO (его пишет convert_time_fast) — разбираем без dateutil
+    upcoming = [
+        e for e in events
+        if e.time_utc and now_utc <= datetime.fromisoformat(e.time_utc) <= until_utc
+    ]
+    for e in upcoming:
+        print(f"[{e.time_local}] {e.country} • {e.title} • {e.importance.upper()}")
 
 # -------------------------------
 # main()
@@ -279,8 +469,10 @@ def main():
     parser.add_argument("--out-format", nargs="*", default=["csv"])
     parser.add_argument("--out-dir", default="./data")
     parser.add_argument("--sqlite-path", default="./data/calendar.sqlite")
+    parser.add_argument("--compress", action="store_true")
     parser.add_argument("--notify", choices=["upcoming"], default=None)
     parser.add_argument("--notify-window", default="24h")
+    parser.add_argument("--no-http-cache", action="store_true")
     parser.add_argument("--log-level", default="INFO")
     args = parser.parse_args()
 
@@ -288,16 +480,36 @@ def main():
 
     os.makedirs(args.out_dir, exist_ok=True)
 
+    cache = None if args.no_http_cache else HttpCache(os.path.join(args.out_dir, HTTP_CACHE_FILE))
+
     providers = []
     if "forex_factory" in args.providers:
-        providers.append(ForexFactoryProvider())
+        providers.append(ForexFactoryProvider(cache))
     if "investing_com" in args.providers:
-        providers.append(InvestingProvider())
+        providers.append(InvestingProvider(cache))
 
     all_events = []
-    for p in providers:
-        evs = p.fetch(args.date_from, args.date_to, args.countries, args.importance)
-        all_events.extend(evs)
+    seen_ids = set()  # дубли по id отбрасываем сразу, а не только в SQLite
+    if providers:
+        # Провайдеры независимы и упираются в сеть — загружаем параллельно
+        with ThreadPoolExecutor(max_workers=len(providers)) as pool:
+            futures = [
+                (p, pool.submit(p.fetch, args.date_from, args.date_to, args.countries, args.importance))
+                for p in providers
+            ]
+            # Результаты собираем в порядке --providers, чтобы вывод был стабильным
+            for p, fut in futures:
+                try:
+                    evs = fut.result()
+                except Exception as e:
+                    logging.warning(f"{type(p).__name__}: ошибка загрузки: {e}")
+                    continue
+                for ev in evs:
+                    if ev.id not in seen_ids:
+                        seen_ids.add(ev.id)
+                        all_events.append(ev)
+    if cache:
+        cache.save()
 
     if not all_events:
         logging.warning("События не найдены")
@@ -306,7 +518,8 @@ def main():
     ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
 
     if "csv" in args.out_format:
-        save_csv(all_events, os.path.join(args.out_dir, f"events_{ts}.csv"))
+        csv_name = f"events_{ts}.csv.gz" if args.compress else f"events_{ts}.csv"
+        save_csv(all_events, os.path.join(args.out_dir, csv_name))
     if "json" in args.out_format:
         save_json(all_events, os.path.join(args.out_dir, f"events_{ts}.json"))
     if "sqlite" in args.out_format: